@@ -1,29 +1,31 @@
 import streamlit as st
 import pandas as pd
 import os
-from reportlab.lib.pagesizes import landscape
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Spacer, Paragraph, PageBreak, Image
-from reportlab.lib.units import cm, inch
+from reportlab.platypus import Table, TableStyle, Paragraph, Flowable
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.lib.units import cm
 from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
-from reportlab.lib.utils import ImageReader
+from reportlab.lib.enums import TA_CENTER
 from io import BytesIO
-import re
-import tempfile
-import base64
+from concurrent.futures import ProcessPoolExecutor
 
 # Auto-install required packages
 try:
-    from PIL import Image as PILImage
+    import segno
 except ImportError:
-    st.error("PIL not available. Please install: pip install pillow")
-    st.stop()
+    # Slower, but produces equivalent symbols
+    segno = None
+    try:
+        import qrcode
+    except ImportError:
+        st.error("segno not available. Please install: pip install segno")
+        st.stop()
 
 try:
-    import qrcode
+    from pypdf import PdfWriter
 except ImportError:
-    st.error("qrcode not available. Please install: pip install qrcode")
+    st.error("pypdf not available. Please install: pip install pypdf")
     st.stop()
 
 # Define sticker dimensions
@@ -40,288 +42,507 @@ DATE_WIDTH_RATIO = 0.65  # 65% for date section
 DATE_HEIGHT = 1.2  # cm
 QR_HEIGHT = 2.3  # cm
 
+# Layout measurements in points, computed once at import
+BOX_MARGIN = 0.2 * cm
+SIDE_MARGIN = 0.1 * cm
+BOX_BOTTOM = STICKER_HEIGHT - CONTENT_BOX_HEIGHT - BOX_MARGIN
+CONTENT_WIDTH = CONTENT_BOX_WIDTH - BOX_MARGIN
+BOX_LEFT = (STICKER_WIDTH - CONTENT_BOX_WIDTH) / 2 + SIDE_MARGIN
+QR_SIZE = 2.5 * cm
+SECTION_GAP = 0.3 * cm
+
+GRN_ROW_HEIGHT = 0.9 * cm
+HEADER_ROW_HEIGHT = 0.9 * cm
+DESC_ROW_HEIGHT = 1.4 * cm
+LOCATION_ROW_HEIGHT = 0.8 * cm
+DATE_ROW_HEIGHT = DATE_HEIGHT * cm
+QR_ROW_HEIGHT = QR_HEIGHT * cm
+
+LOCATION_BOX_WIDTH = CONTENT_WIDTH * 2 / 3 / 4
+DATE_WIDTH = CONTENT_WIDTH * DATE_WIDTH_RATIO
+DATE_LABEL_WIDTH = DATE_WIDTH * 0.4
+
+# The date/QR row sits one cell top padding (3pt) below the section gap
+BOTTOM_GAP = SECTION_GAP + 3
+
+# Sticker table position, centred and one frame padding (6pt) below the box top
+STICKER_TABLE_LEFT = (STICKER_WIDTH - CONTENT_WIDTH) / 2
+STICKER_TABLE_TOP = STICKER_HEIGHT - BOX_MARGIN - 6
+
+# Each sticker is one table on a shared column grid: the label third and
+# four location boxes above, the date label, date value and QR code below.
+# The edges are in left-to-right order for DATE_WIDTH_RATIO = 0.65.
+STICKER_COL_EDGES = [
+    0,
+    DATE_LABEL_WIDTH,
+    CONTENT_WIDTH / 3,
+    CONTENT_WIDTH / 3 + LOCATION_BOX_WIDTH,
+    DATE_WIDTH,
+    CONTENT_WIDTH / 3 + 2 * LOCATION_BOX_WIDTH,
+    CONTENT_WIDTH / 3 + 3 * LOCATION_BOX_WIDTH,
+    CONTENT_WIDTH,
+]
+STICKER_COL_WIDTHS = [right - left for left, right in zip(STICKER_COL_EDGES, STICKER_COL_EDGES[1:])]
+STICKER_ROW_HEIGHTS = [GRN_ROW_HEIGHT, HEADER_ROW_HEIGHT, DESC_ROW_HEIGHT, LOCATION_ROW_HEIGHT,
+                       BOTTOM_GAP, DATE_ROW_HEIGHT, QR_ROW_HEIGHT - DATE_ROW_HEIGHT]
+
+# Below this many distinct QR payloads, process pool startup outweighs the gain
+QR_PARALLEL_MIN_PAYLOADS = 32
+
+# Stickers per sub-document; caps the page streams held in memory at once
+BUILD_CHUNK_SIZE = 200
+
+# Compress page streams; off renders ~10% faster but triples the download size
+PAGE_COMPRESSION = 1
+
+# Smallest sub-document worth rendering in its own worker process
+RENDER_MIN_CHUNK_SIZE = 50
+
+# Location boxes for a blank store location
+EMPTY_LOCATION_PARTS = ('', '', '', '')
+
+# Column detection rules per sticker field, best match first
+COLUMN_RULES = {
+    'grn': [
+        lambda col: 'GRN' in col and ('NO' in col or 'NUM' in col or '#' in col),
+        lambda col: col in ('GRN', 'GRNNO', 'GRN_NO'),
+        lambda col: 'GOODS' in col and 'RECEIPT' in col,
+    ],
+    'part_no': [
+        lambda col: 'PART' in col and ('NO' in col or 'NUM' in col or '#' in col),
+        lambda col: col in ('PARTNO', 'PART'),
+    ],
+    'desc': [
+        lambda col: 'DESC' in col,
+        lambda col: 'NAME' in col,
+    ],
+    'store_location': [
+        lambda col: 'STORE' in col and 'LOC' in col,
+        lambda col: 'LOC' in col or 'POS' in col,
+    ],
+    'receipt_date': [
+        lambda col: 'RECEIPT' in col and 'DATE' in col,
+        lambda col: 'DATE' in col,
+    ],
+}
+
+# Fields every sticker needs, with the column names shown in errors
+REQUIRED_COLUMNS = {
+    'part_no': 'Part No./Part Number',
+    'desc': 'Description/Name',
+    'store_location': 'Store Location',
+}
+
 # Define paragraph styles
-bold_style = ParagraphStyle(name='Bold', fontName='Helvetica-Bold', fontSize=16, alignment=TA_CENTER, leading=14)
 desc_style = ParagraphStyle(name='Description', fontName='Helvetica', fontSize=11, alignment=TA_CENTER, leading=12)
 qty_style = ParagraphStyle(name='Quantity', fontName='Helvetica', fontSize=11, alignment=TA_CENTER, leading=12)
-
-def generate_qr_code(data_string):
-    """Generate a QR code from the given data string"""
-    try:
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_M,
-            box_size=10,
-            border=4,
-        )
-        
+store_location_style = ParagraphStyle(name='StoreLocation', fontName='Helvetica-Bold', fontSize=11, alignment=TA_CENTER)
+qr_placeholder_style = ParagraphStyle(name='QRPlaceholder', fontName='Helvetica-Bold', fontSize=12, alignment=TA_CENTER)
+
+# Row-invariant cell content, shared by every sticker (each table re-wraps it at the same width)
+STORE_LOCATION_LABEL = Paragraph("Store Location", store_location_style)
+QR_PLACEHOLDER = Paragraph("QR", qr_placeholder_style)
+
+# Table styles shared by every sticker
+STICKER_TABLE_STYLE = TableStyle([
+    ('GRID', (0, 0), (-1, 3), 1.2, colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    # Field labels span the first third, their values the location boxes
+    ('FONTNAME', (0, 0), (0, 3), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (0, 3), 11),
+    ('SPAN', (0, 0), (1, 0)),
+    ('SPAN', (2, 0), (-1, 0)),
+    ('SPAN', (0, 1), (1, 1)),
+    ('SPAN', (2, 1), (-1, 1)),
+    ('SPAN', (0, 2), (1, 2)),
+    ('SPAN', (2, 2), (-1, 2)),
+    # GRN and Part No values are plain strings in 16pt bold
+    ('FONTNAME', (2, 0), (2, 1), 'Helvetica-Bold'),
+    ('FONTSIZE', (2, 0), (2, 1), 16),
+    ('LEADING', (2, 0), (2, 1), 14),
+    # Store location boxes; the second one straddles the date/QR split
+    ('SPAN', (0, 3), (1, 3)),
+    ('SPAN', (3, 3), (4, 3)),
+    ('FONTNAME', (2, 3), (-1, 3), 'Helvetica-Bold'),
+    ('FONTSIZE', (2, 3), (-1, 3), 9),
+    # Gap between the sections
+    ('SPAN', (0, 4), (-1, 4)),
+    # Receipt date box
+    ('GRID', (0, 5), (3, 5), 1.2, colors.black),
+    ('SPAN', (1, 5), (3, 5)),
+    ('ALIGN', (0, 5), (0, 5), 'RIGHT'),
+    ('ALIGN', (1, 5), (1, 5), 'LEFT'),
+    ('FONTNAME', (0, 5), (0, 5), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 5), (1, 5), 10),
+    ('SPAN', (0, 6), (3, 6)),
+    # QR code spans both bottom rows
+    ('SPAN', (4, 5), (-1, 6)),
+])
+
+class QRCodeFlowable(Flowable):
+    """Draw a QR code as filled vector squares, one per dark module
+
+    The symbol, including its quiet zone, is scaled to fit ``width`` x
+    ``height``. Drawing it as vectors keeps edges sharp at any print
+    resolution and avoids rasterising and embedding an image per sticker.
+    """
+
+    def __init__(self, matrix, width, height, border=4):
+        Flowable.__init__(self)
+        self.matrix = matrix
+        self.width = width
+        self.height = height
+        self.border = border
+
+    def draw(self):
+        modules = len(self.matrix) + 2 * self.border
+
+        # Work in module units with the origin at the top-left module, so
+        # every rectangle has small integer coordinates
+        self.canv.saveState()
+        self.canv.translate(0, self.height)
+        self.canv.scale(self.width / modules, -self.height / modules)
+        self.canv.translate(self.border, self.border)
+
+        # One rectangle per horizontal run of dark modules
+        path = self.canv.beginPath()
+        for r, row in enumerate(self.matrix):
+            c = 0
+            width = len(row)
+            while c < width:
+                if not row[c]:
+                    c += 1
+                    continue
+                start = c
+                while c < width and row[c]:
+                    c += 1
+                path.rect(start, r, c - start, 1)
+
+        self.canv.setFillColor(colors.black)
+        self.canv.drawPath(path, stroke=0, fill=1)
+        self.canv.restoreState()
+
+def _encode_qr(data_string):
+    """Encode the given data string as a QR code and return its module matrix
+
+    The matrix is a tuple of rows without the quiet zone, each a bytes object
+    with 1 for a dark module. Kept at module level so it can be pickled into
+    worker processes.
+    """
+    if segno is None:
+        qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=0)
         qr.add_data(data_string)
         qr.make(fit=True)
-        
-        qr_img = qr.make_image(fill_color="black", back_color="white")
-        
-        img_buffer = BytesIO()
-        qr_img.save(img_buffer, format='PNG')
-        img_buffer.seek(0)
-        
-        return Image(img_buffer, width=2.5*cm, height=2.5*cm)
+        return tuple(bytes(row) for row in qr.modules)
+
+    # make_qr never picks a Micro QR; keep error correction fixed at M
+    qr = segno.make_qr(data_string, error='m', boost_error=False)
+    return tuple(bytes(row) for row in qr.matrix)
+
+def generate_qr_code(data_string, qr_cache=None):
+    """Generate the QR code module matrix for the given data string
+
+    If ``qr_cache`` is given, module matrices are looked up there by payload
+    and stored on a miss, so identical payloads are only encoded once.
+    Returns None if the data could not be encoded.
+    """
+    try:
+        matrix = qr_cache.get(data_string) if qr_cache is not None else None
+        if matrix is None:
+            matrix = _encode_qr(data_string)
+            if qr_cache is not None:
+                qr_cache[data_string] = matrix
+
+        return matrix
     except Exception as e:
         st.error(f"Error generating QR code: {e}")
         return None
 
+def encode_qr_payloads(payloads):
+    """Pre-encode the distinct QR payloads in worker processes
+
+    Returns a payload -> module matrix dict to use as the ``qr_cache`` of
+    generate_qr_code. Small batches, single-core hosts and pool failures
+    return an empty dict so the codes are encoded lazily in this process,
+    where encoding errors are reported per sticker.
+    """
+    unique_payloads = list(dict.fromkeys(payloads))
+    workers = os.cpu_count() or 1
+    if workers < 2 or len(unique_payloads) < QR_PARALLEL_MIN_PAYLOADS:
+        return {}
+
+    try:
+        chunksize = max(1, min(32, len(unique_payloads) // workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            matrices = list(executor.map(_encode_qr, unique_payloads, chunksize=chunksize))
+    except Exception:
+        return {}
+
+    return dict(zip(unique_payloads, matrices))
+
 def parse_location_string(location_str):
     """Parse a location string into components for table display - only 4 boxes"""
-    location_parts = [''] * 4
     if not location_str or not isinstance(location_str, str):
-        return location_parts
-
-    location_str = location_str.strip()
-    pattern = r'([^_\s]+)'
-    matches = re.findall(pattern, location_str)
-
-    for i, match in enumerate(matches[:4]):
-        location_parts[i] = match
+        return EMPTY_LOCATION_PARTS
+
+    # Equivalent to splitting on runs of underscores and whitespace
+    matches = location_str.replace('_', ' ').split()[:4]
+    if len(matches) < 4:
+        matches += [''] * (4 - len(matches))
+    return tuple(matches)
+
+def detect_columns(cols):
+    """Match upper-case column names to sticker fields in a single pass
+
+    Returns a dict mapping each field in COLUMN_RULES to the first column
+    satisfying its highest-priority rule, or None if no rule matched.
+    """
+    best = {}
+    for col in cols:
+        if not isinstance(col, str):
+            continue
+        for field, rules in COLUMN_RULES.items():
+            # Only a strictly better rule can replace an earlier column
+            rank_limit = best[field][0] if field in best else len(rules)
+            for rank in range(rank_limit):
+                if rules[rank](col):
+                    best[field] = (rank, col)
+                    break
+
+    return {field: best[field][1] if field in best else None for field in COLUMN_RULES}
+
+def _column_as_str_series(df, col):
+    """Return a column as a Series of strings with missing values blanked"""
+    if col is None or col not in df.columns:
+        series = pd.Series("", index=df.index, dtype=object)
+    else:
+        series = df[col].astype(object).where(df[col].notna(), "")
+    return series.astype(str)
+
+def draw_border(canvas):
+    """Draw the content box outline on a sticker page"""
+    canvas.saveState()
+    canvas.setStrokeColor(colors.black)
+    canvas.setLineWidth(1.8)
+    canvas.rect(
+        BOX_LEFT,
+        BOX_BOTTOM,
+        CONTENT_WIDTH,
+        CONTENT_BOX_HEIGHT
+    )
+    canvas.restoreState()
+
+def build_sticker_pdf(tables):
+    """Draw each sticker table on its own page and return the PDF bytes
+
+    Pages are drawn straight onto a canvas as the tables are consumed; each
+    sticker is a single fixed-size table, so platypus frames and page
+    templates are not needed. No tables still gives one blank sticker page.
+    """
+    pdf_buffer = BytesIO()
+    canvas = Canvas(pdf_buffer, pagesize=STICKER_PAGESIZE, pageCompression=PAGE_COMPRESSION)
+
+    pages = 0
+    for table in tables:
+        draw_border(canvas)
+        _, height = table.wrapOn(canvas, CONTENT_WIDTH, CONTENT_BOX_HEIGHT)
+        table.drawOn(canvas, STICKER_TABLE_LEFT, STICKER_TABLE_TOP - height)
+        canvas.showPage()
+        pages += 1
+
+    if not pages:
+        draw_border(canvas)
+        canvas.showPage()
+
+    canvas.save()
+    return pdf_buffer.getvalue()
+
+def merge_pdfs(pdf_chunks):
+    """Concatenate PDF documents given as bytes into a single PDF"""
+    if len(pdf_chunks) == 1:
+        return pdf_chunks[0]
+
+    writer = PdfWriter()
+    for pdf_chunk in pdf_chunks:
+        writer.append(BytesIO(pdf_chunk))
+
+    merged = BytesIO()
+    writer.write(merged)
+    return merged.getvalue()
+
+def sticker_table(grn_no, part_no, desc_display, location_parts, clean_receipt_date, qr_matrix):
+    """Build the table making up a single sticker page"""
+    if qr_matrix:
+        qr_image = QRCodeFlowable(qr_matrix, width=QR_SIZE, height=QR_SIZE)
+    else:
+        qr_image = QR_PLACEHOLDER
+
+    box1, box2, box3, box4 = location_parts
+    table = Table(
+        [["GRN No", '', grn_no, '', '', '', ''],
+         ["Part No", '', part_no, '', '', '', ''],
+         ["Description", '', Paragraph(desc_display, desc_style), '', '', '', ''],
+         [STORE_LOCATION_LABEL, '', box1, box2, '', box3, box4],
+         [''] * 7,
+         ["Receipt Date:", Paragraph(str(clean_receipt_date), qty_style), '', '', qr_image, '', ''],
+         [''] * 7],
+        colWidths=STICKER_COL_WIDTHS,
+        rowHeights=STICKER_ROW_HEIGHTS
+    )
 
-    return location_parts
+    table.setStyle(STICKER_TABLE_STYLE)
+
+    return table
+
+def render_sticker_chunk(stickers):
+    """Render a sequence of sticker field tuples to a PDF and return its bytes
+
+    Each tuple holds the sticker_table arguments. Takes only plain values
+    so it can run in a worker process.
+    """
+    return build_sticker_pdf(sticker_table(*sticker) for sticker in stickers)
+
+def render_sticker_chunks(chunks, on_progress):
+    """Yield the rendered PDF of each chunk, in order
+
+    Chunks are rendered in worker processes when there is more than one
+    chunk and more than one core. If the pool fails, every chunk is
+    rendered again in this process, so build errors surface where they can
+    be reported. ``on_progress`` is called with the number of chunks done.
+    """
+    workers = min(os.cpu_count() or 1, len(chunks))
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pdf_chunks = []
+                for pdf_chunk in executor.map(render_sticker_chunk, chunks):
+                    pdf_chunks.append(pdf_chunk)
+                    on_progress(len(pdf_chunks))
+            yield from pdf_chunks
+            return
+        except Exception:
+            pass
+
+    for index, chunk in enumerate(chunks):
+        pdf_chunk = render_sticker_chunk(chunk)
+        on_progress(index + 1)
+        yield pdf_chunk
 
 def generate_sticker_labels(df):
-    """Generate sticker labels with QR code from DataFrame"""
-    
-    def draw_border(canvas, doc):
-        canvas.saveState()
-        x_offset = (STICKER_WIDTH - CONTENT_BOX_WIDTH) / 2
-        y_offset = STICKER_HEIGHT - CONTENT_BOX_HEIGHT - 0.2*cm
-        canvas.setStrokeColor(colors.Color(0, 0, 0, alpha=0.95))
-        canvas.setLineWidth(1.8)
-        canvas.rect(
-            x_offset + doc.leftMargin,
-            y_offset,
-            CONTENT_BOX_WIDTH - 0.2*cm,
-            CONTENT_BOX_HEIGHT
-        )
-        canvas.restoreState()
-
-    # Identify columns (case-insensitive)
-    original_columns = df.columns.tolist()
-    df_copy = df.copy()
-    df_copy.columns = [col.upper() if isinstance(col, str) else col for col in df_copy.columns]
-    cols = df_copy.columns.tolist()
-
-    # Find GRN No. column
-    grn_col = next((col for col in cols if 'GRN' in col and ('NO' in col or 'NUM' in col or '#' in col)),
-                   next((col for col in cols if col in ['GRN', 'GRNNO', 'GRN_NO']), 
-                        next((col for col in cols if 'GOODS' in col and 'RECEIPT' in col), None)))
-
-    # Find relevant columns
-    part_no_col = next((col for col in cols if 'PART' in col and ('NO' in col or 'NUM' in col or '#' in col)),
-                   next((col for col in cols if col in ['PARTNO', 'PART']), cols[0]))
-
-    desc_col = next((col for col in cols if 'DESC' in col),
-                   next((col for col in cols if 'NAME' in col), cols[1] if len(cols) > 1 else part_no_col))
-
-    # Look for store location column
-    store_location_col = next((col for col in cols if 'STORE' in col and 'LOC' in col),
-                             next((col for col in cols if 'STORELOCATION' in col or 'STORE_LOCATION' in col),
-                                  next((col for col in cols if 'LOC' in col or 'POS' in col or 'LOCATION' in col),
-                                       cols[2] if len(cols) > 2 else desc_col)))
-
-    # Look for receipt date column
-    receipt_date_col = next((col for col in cols if 'RECEIPT' in col and 'DATE' in col),
-                           next((col for col in cols if 'RECEIPTDATE' in col or 'RECEIPT_DATE' in col),
-                                next((col for col in cols if 'DATE' in col), None)))
-
-    # Create temporary PDF file
-    temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-    temp_pdf_path = temp_pdf.name
-    temp_pdf.close()
-
-    # Create document with minimal margins
-    doc = SimpleDocTemplate(temp_pdf_path, pagesize=STICKER_PAGESIZE,
-                          topMargin=0.2*cm,
-                          bottomMargin=(STICKER_HEIGHT - CONTENT_BOX_HEIGHT - 0.2*cm),
-                          leftMargin=0.1*cm, rightMargin=0.1*cm)
-
-    content_width = CONTENT_BOX_WIDTH - 0.2*cm
-    all_elements = []
+    """Generate sticker labels with QR code from DataFrame
+
+    Stickers are drawn page by page into sub-documents of at most
+    BUILD_CHUNK_SIZE pages, rendered in parallel where possible and merged
+    at the end.
+    Returns the PDF as bytes, or None if the document could not be built.
+    """
+    # Identify columns (case-insensitive) via an upper-case -> original name map
+    col_map = {}
+    for col in df.columns:
+        col_map.setdefault(col.upper() if isinstance(col, str) else col, col)
+    cols = list(col_map)
+
+    # Find the sticker columns in one pass
+    found = {field: col_map.get(col) for field, col in detect_columns(cols).items()}
+
+    # Fail before building anything rather than printing the wrong columns
+    missing = [label for field, label in REQUIRED_COLUMNS.items() if found[field] is None]
+    if missing:
+        st.error(f"Required column(s) not found: {', '.join(missing)}. "
+                 f"Columns in file: {', '.join(map(str, df.columns))}")
+        return None
+
+    grn_col = found['grn']
+    part_no_col = found['part_no']
+    desc_col = found['desc']
+    store_location_col = found['store_location']
+    receipt_date_col = found['receipt_date']
 
     # Progress bar
     progress_bar = st.progress(0)
     status_placeholder = st.empty()
     
-    # Process each row as a single sticker
-    total_rows = len(df_copy)
-    for index, row in df_copy.iterrows():
-        # Update progress
-        progress = (index + 1) / total_rows
+    # Derive every sticker field column-wise before touching ReportLab
+    grn_series = _column_as_str_series(df, grn_col)
+    part_no_series = _column_as_str_series(df, part_no_col)
+    desc_series = _column_as_str_series(df, desc_col)
+    store_location_series = _column_as_str_series(df, store_location_col)
+
+    # Clean receipt date by dropping any time-of-day part
+    clean_receipt_date_series = _column_as_str_series(df, receipt_date_col).str.split(" ", n=1).str[0].astype(str)
+
+    desc_display_series = desc_series.where(desc_series.str.len() <= 50, desc_series.str.slice(0, 47) + "...")
+
+    payloads = ("GRN No: " + grn_series + "\nPart No: " + part_no_series
+                + "\nDescription: " + desc_series + "\nStore Location: " + store_location_series
+                + "\nReceipt Date: " + clean_receipt_date_series).tolist()
+
+    # Batches share a handful of locations; parse each distinct string once
+    locations = store_location_series.tolist()
+    location_parts_by_str = {loc: parse_location_string(loc) for loc in dict.fromkeys(locations)}
+    location_parts_list = [location_parts_by_str[loc] for loc in locations]
+
+    records = list(zip(grn_series.tolist(), part_no_series.tolist(), desc_display_series.tolist(),
+                       location_parts_list, clean_receipt_date_series.tolist()))
+
+    # QR module matrices keyed by payload, shared across rows with identical data
+    status_placeholder.text("Generating QR codes...")
+    qr_cache = encode_qr_payloads(payloads)
+
+    # Attach each sticker's QR matrix; reports encoding errors in this process
+    stickers = [(*record, generate_qr_code(payload, qr_cache))
+                for record, payload in zip(records, payloads)]
+
+    # Split into sub-documents, small enough to spread across the cores
+    total_rows = len(stickers)
+    workers = os.cpu_count() or 1
+    chunk_size = min(BUILD_CHUNK_SIZE, max(RENDER_MIN_CHUNK_SIZE, -(-total_rows // workers)))
+    chunks = [stickers[i:i + chunk_size] for i in range(0, total_rows, chunk_size)]
+
+    def on_progress(done):
+        stickers_done = min(done * chunk_size, total_rows)
+        progress = stickers_done / total_rows
         progress_bar.progress(progress)
-        status_placeholder.text(f"Creating sticker {index+1} of {total_rows} ({int(progress*100)}%)")
-        
-        elements = []
-
-        # Extract data
-        grn_no = str(row[grn_col]) if grn_col and grn_col in row and pd.notna(row[grn_col]) else ""
-        part_no = str(row[part_no_col])
-        desc = str(row[desc_col])
-        store_location = str(row[store_location_col]) if store_location_col and store_location_col in row else ""
-        receipt_date = str(row[receipt_date_col]) if receipt_date_col and receipt_date_col in row and pd.notna(row[receipt_date_col]) else ""
-        
-        location_parts = parse_location_string(store_location)
-
-        # Define row heights
-        grn_row_height = 0.9*cm
-        header_row_height = 0.9*cm
-        desc_row_height = 1.4*cm
-        location_row_height = 0.8*cm
-
-        # Clean receipt date
-        clean_receipt_date = ""
-        if receipt_date and receipt_date != "nan":
-            try:
-                if " " in receipt_date:
-                    clean_receipt_date = receipt_date.split(" ")[0]
-                else:
-                    clean_receipt_date = receipt_date
-            except:
-                clean_receipt_date = receipt_date
-
-        # Generate QR code
-        qr_data = f"GRN No: {grn_no}\nPart No: {part_no}\nDescription: {desc}\nStore Location: {store_location}\nReceipt Date: {clean_receipt_date}"
-        qr_image = generate_qr_code(qr_data)
-
-        # Main table data
-        main_table_data = [
-            ["GRN No", Paragraph(f"{grn_no}", bold_style)],
-            ["Part No", Paragraph(f"{part_no}", bold_style)],
-            ["Description", Paragraph(desc[:47] + "..." if len(desc) > 50 else desc, desc_style)]
-        ]
-
-        # Create main table
-        main_table = Table(main_table_data,
-                         colWidths=[content_width/3, content_width*2/3],
-                         rowHeights=[grn_row_height, header_row_height, desc_row_height])
-
-        main_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 1.2, colors.Color(0, 0, 0, alpha=0.95)),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (0, -1), 11),
-        ]))
-
-        elements.append(main_table)
-
-        # Store Location section
-        store_location_label = Paragraph("Store Location", ParagraphStyle(
-            name='StoreLocation', fontName='Helvetica-Bold', fontSize=11, alignment=TA_CENTER
-        ))
-
-        inner_table_width = content_width * 2 / 3
-        inner_col_widths = [inner_table_width / 4] * 4
-
-        store_location_inner_table = Table(
-            [location_parts],
-            colWidths=inner_col_widths,
-            rowHeights=[location_row_height]
-        )
-
-        store_location_inner_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 1.2, colors.Color(0, 0, 0, alpha=0.95)),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ]))
-
-        store_location_table = Table(
-            [[store_location_label, store_location_inner_table]],
-            colWidths=[content_width/3, inner_table_width],
-            rowHeights=[location_row_height]
-        )
-
-        store_location_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 1.2, colors.Color(0, 0, 0, alpha=0.95)),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-
-        elements.append(store_location_table)
-
-        # Bottom section
-        date_row_height = DATE_HEIGHT * cm
-        qr_row_height = QR_HEIGHT * cm
-        date_width = content_width * DATE_WIDTH_RATIO
-        qr_width = content_width - date_width
-
-        # Create Receipt Date box
-        date_table = Table(
-            [["Receipt Date:", Paragraph(str(clean_receipt_date), qty_style)]],
-            colWidths=[date_width*0.4, date_width*0.6],
-            rowHeights=[date_row_height]
-        )
-
-        date_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 1.2, colors.Color(0, 0, 0, alpha=0.95)),
-            ('ALIGN', (0, 0), (0, 0), 'RIGHT'),
-            ('ALIGN', (1, 0), (1, 0), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (0, 0), 10),
-            ('FONTSIZE', (1, 0), (1, 0), 10),
-        ]))
-
-        # Create QR Code box
-        if qr_image:
-            qr_table = Table(
-                [[qr_image]],
-                colWidths=[qr_width],
-                rowHeights=[qr_row_height]
-            )
-        else:
-            qr_table = Table(
-                [[Paragraph("QR", ParagraphStyle(
-                    name='QRPlaceholder', fontName='Helvetica-Bold', fontSize=12, alignment=TA_CENTER
-                ))]],
-                colWidths=[qr_width],
-                rowHeights=[qr_row_height]
-            )
-
-        qr_table.setStyle(TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0, colors.Color(1, 1, 1, alpha=0)),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-
-        # Combined bottom table
-        bottom_table = Table(
-            [[date_table, qr_table]],
-            colWidths=[date_width, qr_width],
-            rowHeights=[qr_row_height]
-        )
+        status_placeholder.text(f"Created {stickers_done} of {total_rows} stickers ({int(progress*100)}%)")
 
-        bottom_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
-
-        elements.append(Spacer(1, 0.3*cm))
-        elements.append(bottom_table)
-
-        all_elements.extend(elements)
-
-        # Add page break except for last sticker
-        if index < len(df_copy) - 1:
-            all_elements.append(PageBreak())
+    status_placeholder.text(f"Creating {total_rows} stickers...")
+    try:
+        pdf_chunks = list(render_sticker_chunks(chunks, on_progress))
+    except Exception as e:
+        st.error(f"Error building PDF: {e}")
+        return None
 
     # Build the document
     try:
-        doc.build(all_elements, onFirstPage=draw_border, onLaterPages=draw_border)
+        pdf_bytes = merge_pdfs(pdf_chunks) if pdf_chunks else build_sticker_pdf([])
         status_placeholder.text("PDF generated successfully!")
         progress_bar.progress(1.0)
-        return temp_pdf_path
+        return pdf_bytes
     except Exception as e:
         st.error(f"Error building PDF: {e}")
         return None
 
+def read_uploaded_file(uploaded_file):
+    """Read an uploaded CSV or Excel file into a DataFrame
+
+    CSVs go through the multithreaded pyarrow parser and Excel workbooks
+    through the Rust-based calamine reader. Either falls back to pandas'
+    default parser if its fast engine is missing or rejects the file.
+    """
+    if uploaded_file.name.lower().endswith('.csv'):
+        try:
+            return pd.read_csv(uploaded_file, engine='pyarrow', dtype_backend='pyarrow')
+        except Exception:
+            uploaded_file.seek(0)
+            return pd.read_csv(uploaded_file)
+
+    try:
+        return pd.read_excel(uploaded_file, engine='calamine')
+    except Exception:
+        uploaded_file.seek(0)
+        return pd.read_excel(uploaded_file)
+
 def main():
     st.set_page_config(
         page_title="Put Away Zone Label Generator",
@@ -352,10 +573,7 @@ def main():
         if uploaded_file is not None:
             try:
                 # Read the file
-                if uploaded_file.name.lower().endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
-                else:
-                    df = pd.read_excel(uploaded_file)
+                df = read_uploaded_file(uploaded_file)
                 
                 st.success(f"✅ File loaded successfully! Found {len(df)} rows and {len(df.columns)} columns.")
                 
@@ -371,18 +589,14 @@ def main():
                 
                 if st.button("🚀 Generate Sticker Labels", type="primary", use_container_width=True):
                     with st.spinner("Generating sticker labels..."):
-                        pdf_path = generate_sticker_labels(df)
+                        pdf_bytes = generate_sticker_labels(df)
                         
-                        if pdf_path:
+                        if pdf_bytes:
                             st.success("🎉 Sticker labels generated successfully!")
                             
                             # Create download section
                             st.subheader("📥 Download Your PDF")
                             
-                            # Read PDF file
-                            with open(pdf_path, "rb") as pdf_file:
-                                pdf_bytes = pdf_file.read()
-                            
                             # Create filename
                             filename = f"{uploaded_file.name.split('.')[0]}_sticker_labels.pdf"
                             
@@ -415,12 +629,6 @@ def main():
                                 # File info
                                 file_size_mb = len(pdf_bytes) / (1024 * 1024)
                                 st.info(f"📊 File size: {file_size_mb:.2f} MB | Labels: {len(df)}")
-                            
-                            # Clean up temporary file
-                            try:
-                                os.unlink(pdf_path)
-                            except:
-                                pass
                         else:
                             st.error("❌ Failed to generate sticker labels.")
                             